@@ -1,13 +1,13 @@
 """Pydantic models for API request/response validation."""
 
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field
 from typing import Optional, Any
 
 
 class QuizRequest(BaseModel):
     """Request model for quiz endpoint."""
     
-    email: EmailStr = Field(..., description="Student email address")
+    email: str = Field(..., min_length=3, max_length=254, description="Student email address")
     secret: str = Field(..., description="Secret string for verification")
     url: str = Field(..., description="Quiz URL to solve")
     
@@ -39,7 +39,7 @@ class QuizResponse(BaseModel):
 class SubmitRequest(BaseModel):
     """Request model for submitting quiz answers."""
     
-    email: EmailStr = Field(..., description="Student email address")
+    email: str = Field(..., min_length=3, max_length=254, description="Student email address")
     secret: str = Field(..., description="Secret string for verification")
     url: str = Field(..., description="Quiz URL being answered")
     answer: Any = Field(..., description="Answer to the quiz (can be bool, int, str, dict, etc.)")
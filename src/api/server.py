@@ -1,9 +1,13 @@
 """FastAPI server for receiving and processing quiz tasks."""
 
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
 import asyncio
-from typing import Dict, Any
+import hmac
+import orjson
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright
+from pydantic import TypeAdapter
 
 from src.api.models import QuizRequest, QuizResponse
 from src.config import settings
@@ -11,11 +15,46 @@ from src.utils.logger import logger
 from src.solver.quiz_solver import QuizSolver
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Keep one Chromium instance alive for the whole process.
+
+    Each quiz task gets its own context/page from this browser instead of
+    paying a full browser cold start per request.
+    """
+    app.state.playwright = await async_playwright().start()
+    app.state.browser = await app.state.playwright.chromium.launch(
+        headless=True,
+        args=['--no-sandbox', '--disable-setuid-sandbox']
+    )
+    logger.info("Shared browser started")
+    yield
+    await QuizSolver.close_submit_client()
+    await app.state.browser.close()
+    await app.state.playwright.stop()
+    logger.info("Shared browser closed")
+
+
 app = FastAPI(
     title="LLM Analysis Quiz API",
     description="API endpoint for receiving and solving quiz tasks",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
+# Compiled validator, built once at import time instead of per request
+_QUIZ_ADAPTER = TypeAdapter(QuizRequest)
+
+# Background task bookkeeping: retain task references so they can't be
+# garbage-collected mid-flight, and cap concurrent quiz chains
+_INFLIGHT: set[asyncio.Task] = set()
+_SEM = asyncio.Semaphore(settings.max_concurrent_quizzes)
+
+# The happy-path /quiz response never changes; serialize it once
+_SUCCESS_BYTES = orjson.dumps({
+    "status": "success",
+    "message": "Quiz task received and processing started"
+})
 
 
 @app.exception_handler(Exception)
@@ -44,56 +83,65 @@ async def receive_quiz(request: Request):
     """
     # Parse JSON
     try:
-        body = await request.json()
-    except Exception as e:
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
         logger.error(f"Invalid JSON received: {e}")
         raise HTTPException(status_code=400, detail="Invalid JSON payload")
-    
+
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+
+    # Verify secret and email before any model validation, in constant time.
+    # Compare bytes: compare_digest raises TypeError on non-ASCII str input
+    if not hmac.compare_digest(str(body.get("secret", "")).encode(), settings.secret.encode()):
+        logger.warning("Invalid secret received")
+        raise HTTPException(status_code=403, detail="Invalid secret")
+
+    if not hmac.compare_digest(str(body.get("email", "")).encode(), settings.email.encode()):
+        logger.warning(f"Invalid email received: {body.get('email')}")
+        raise HTTPException(status_code=403, detail="Invalid email")
+
     # Validate request
     try:
-        quiz_request = QuizRequest(**body)
+        quiz_request = _QUIZ_ADAPTER.validate_python(body)
     except Exception as e:
         logger.error(f"Request validation failed: {e}")
         raise HTTPException(status_code=400, detail=f"Invalid request: {str(e)}")
     
-    # Verify secret
-    if quiz_request.secret != settings.secret:
-        logger.warning(f"Invalid secret received from {quiz_request.email}")
-        raise HTTPException(status_code=403, detail="Invalid secret")
-    
-    # Verify email
-    if quiz_request.email != settings.email:
-        logger.warning(f"Invalid email received: {quiz_request.email}")
-        raise HTTPException(status_code=403, detail="Invalid email")
-    
     logger.info(f"Quiz task received for URL: {quiz_request.url}")
     
-    # Start quiz solving in background
-    asyncio.create_task(solve_quiz_task(quiz_request))
+    # Start quiz solving in background, reusing the lifespan browser
+    browser = getattr(request.app.state, "browser", None)
+    task = asyncio.create_task(solve_quiz_task(quiz_request, browser=browser))
+    _INFLIGHT.add(task)
+    task.add_done_callback(_INFLIGHT.discard)
     
-    return QuizResponse(
-        status="success",
-        message="Quiz task received and processing started"
+    return Response(
+        content=_SUCCESS_BYTES,
+        media_type="application/json",
+        status_code=200
     )
 
 
-async def solve_quiz_task(quiz_request: QuizRequest):
+async def solve_quiz_task(quiz_request: QuizRequest, browser=None):
     """
     Solve a quiz task in the background.
-    
+
     Args:
         quiz_request: Validated quiz request
+        browser: Shared Playwright browser from the app lifespan, if running
     """
-    try:
-        solver = QuizSolver()
-        await solver.solve_quiz_chain(
-            initial_url=quiz_request.url,
-            email=quiz_request.email,
-            secret=quiz_request.secret
-        )
-        logger.info(f"Quiz chain completed for {quiz_request.url}")
-    except Exception as e:
-        logger.error(f"Error solving quiz: {e}", exc_info=True)
+    async with _SEM:
+        try:
+            solver = QuizSolver(browser=browser)
+            await solver.solve_quiz_chain(
+                initial_url=quiz_request.url,
+                email=quiz_request.email,
+                secret=quiz_request.secret
+            )
+            logger.info(f"Quiz chain completed for {quiz_request.url}")
+        except Exception as e:
+            logger.error(f"Error solving quiz: {e}", exc_info=True)
 
 
 @app.get("/health")
@@ -117,5 +165,15 @@ async def root():
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        "src.api.server:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=(os.cpu_count() or 2),
+        log_level="warning",
+        access_log=False
+    )
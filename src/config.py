@@ -1,30 +1,41 @@
 """Configuration management for the LLM Analysis Quiz application."""
 
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
-    
+
     # User credentials
     email: str = Field(..., description="User email address")
     secret: str = Field(..., description="Secret string for request verification")
-    
+
     # API configuration
     openai_api_key: str = Field(..., description="OpenAI API key")
     api_endpoint_url: str = Field(..., description="Deployed API endpoint URL")
     github_repo_url: str = Field(..., description="GitHub repository URL")
-    
+
     # Application settings
     timeout_seconds: int = Field(default=180, description="Quiz timeout in seconds (3 minutes)")
     max_payload_size: int = Field(default=1048576, description="Maximum payload size in bytes (1MB)")
-    
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    max_concurrent_quizzes: int = Field(default=4, description="Maximum quiz chains solved concurrently")
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        frozen=True
+    )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the settings singleton, reading .env only once per process."""
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -1,6 +1,8 @@
 """Test prompt effectiveness."""
 
+import httpx
 import openai
+from functools import lru_cache
 from pathlib import Path
 import sys
 
@@ -10,8 +12,18 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.config import settings
 
 
+# Shared client: construct httpx pool + TLS context once per process
+_CLIENT = openai.OpenAI(
+    api_key=settings.openai_api_key,
+    http_client=httpx.Client(
+        limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
+    )
+)
+
+
+@lru_cache(maxsize=None)
 def load_prompt(filename: str) -> str:
-    """Load prompt from file."""
+    """Load prompt from file, reading each file once per process."""
     prompt_path = Path(__file__).parent / filename
     with open(prompt_path, 'r') as f:
         return f.read().strip()
@@ -39,11 +51,9 @@ def test_prompts(code_word: str = "elephant"):
         print(f"WARNING: User prompt is {len(user_prompt)} chars (max 100)")
     
     # Test with OpenAI
-    client = openai.OpenAI(api_key=settings.openai_api_key)
-    
     print("Testing with GPT-4...")
     try:
-        response = client.chat.completions.create(
+        response = _CLIENT.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {
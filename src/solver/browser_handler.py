@@ -1,7 +1,7 @@
 """Browser automation handler using Playwright."""
 
-import asyncio
 import base64
+import aiofiles
 from typing import Optional, Dict, Any
 from playwright.async_api import async_playwright, Browser, Page, BrowserContext
 from pathlib import Path
@@ -9,16 +9,48 @@ from pathlib import Path
 from src.utils.logger import logger
 
 
+# Resource types that text extraction never needs
+_BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+
+
 class BrowserHandler:
     """Handles browser automation for quiz page rendering and interaction."""
-    
-    def __init__(self):
-        """Initialize browser handler."""
+
+    __slots__ = ("browser", "context", "page", "playwright", "block_assets")
+
+    def __init__(self, block_assets: bool = True):
+        """
+        Initialize browser handler.
+
+        Args:
+            block_assets: Abort image/font/media/stylesheet requests at the
+                context level; pass False when the page must render fully
+                (e.g. for screenshots)
+        """
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self.playwright = None
-    
+        self.block_assets = block_assets
+
+    @classmethod
+    def from_shared(cls, browser: Browser) -> "BrowserHandler":
+        """
+        Create a handler backed by an already-running browser.
+
+        The handler only opens (and later closes) its own context and page;
+        the browser itself stays alive for other handlers to reuse.
+
+        Args:
+            browser: A running Playwright Browser instance
+
+        Returns:
+            BrowserHandler bound to the shared browser
+        """
+        handler = cls()
+        handler.browser = browser
+        return handler
+
     async def __aenter__(self):
         """Async context manager entry."""
         await self.start()
@@ -31,21 +63,51 @@ class BrowserHandler:
     async def start(self):
         """Start the browser."""
         try:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(
-                headless=True,
-                args=['--no-sandbox', '--disable-setuid-sandbox']
-            )
+            if self.browser is None:
+                self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(
+                    headless=True,
+                    args=[
+                        '--no-sandbox',
+                        '--disable-setuid-sandbox',
+                        '--disable-dev-shm-usage',
+                        '--disable-gpu',
+                        '--disable-extensions',
+                        '--blink-settings=imagesEnabled=false'
+                    ]
+                )
+            # Small viewport keeps Chromium layout/paint work minimal for
+            # text extraction
             self.context = await self.browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+                viewport={'width': 1024, 'height': 768},
+                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                bypass_csp=True,
+                java_script_enabled=True,
+                ignore_https_errors=True,
+                service_workers='block'
             )
+            if self.block_assets:
+                await self.context.route("**/*", self._filter_route)
             self.page = await self.context.new_page()
             logger.info("Browser started successfully")
         except Exception as e:
             logger.error(f"Failed to start browser: {e}")
             raise
     
+    async def new_page(self):
+        """Swap in a fresh page, keeping the context and browser alive."""
+        if self.page:
+            await self.page.close()
+        self.page = await self.context.new_page()
+
+    @staticmethod
+    async def _filter_route(route):
+        """Abort requests for resource types text extraction never needs."""
+        if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
     async def close(self):
         """Close the browser."""
         try:
@@ -53,30 +115,39 @@ class BrowserHandler:
                 await self.page.close()
             if self.context:
                 await self.context.close()
-            if self.browser:
-                await self.browser.close()
+            # Only tear down the browser if this handler launched it
             if self.playwright:
+                if self.browser:
+                    await self.browser.close()
                 await self.playwright.stop()
             logger.info("Browser closed successfully")
         except Exception as e:
             logger.error(f"Error closing browser: {e}")
     
-    async def navigate_to(self, url: str, wait_for: str = 'networkidle') -> bool:
+    async def navigate_to(self, url: str, wait_for: str = 'networkidle',
+                          wait_for_result: bool = False) -> bool:
         """
         Navigate to a URL.
-        
+
         Args:
             url: URL to navigate to
             wait_for: Wait condition ('load', 'domcontentloaded', 'networkidle')
-            
+            wait_for_result: Also wait for the quiz's #result element; only
+                quiz pages have one, so arbitrary scrape targets should not
+                pay the wait timeout
+
         Returns:
             True if successful, False otherwise
         """
         try:
             logger.info(f"Navigating to {url}")
             await self.page.goto(url, wait_until=wait_for, timeout=30000)
-            # Wait a bit for any dynamic content
-            await asyncio.sleep(2)
+            if wait_for_result:
+                # Wait for the quiz content if present, instead of a fixed sleep
+                try:
+                    await self.page.wait_for_selector("#result", timeout=5000)
+                except Exception:
+                    pass
             return True
         except Exception as e:
             logger.error(f"Failed to navigate to {url}: {e}")
@@ -147,10 +218,12 @@ class BrowserHandler:
         try:
             # Wait for result div to be populated
             await self.page.wait_for_selector("#result", timeout=10000)
-            
-            # Get the content
-            content = await self.get_inner_html("#result")
-            
+
+            # Pull just the text over CDP instead of serializing the HTML
+            content = await self.page.eval_on_selector(
+                "#result", "e => e.innerText || e.textContent"
+            )
+
             if not content:
                 # Try getting text content from body
                 content = await self.get_text_content("body")
@@ -174,24 +247,21 @@ class BrowserHandler:
         """
         try:
             logger.info(f"Downloading file from {url}")
-            
-            # Navigate to the URL
-            response = await self.page.goto(url, wait_until='networkidle')
-            
-            if response and response.ok:
-                # Get the content
-                content = await response.body()
-                
-                # Save to file
-                Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-                with open(output_path, 'wb') as f:
-                    f.write(content)
-                
-                logger.info(f"File downloaded successfully to {output_path}")
-                return True
-            else:
-                logger.error(f"Failed to download file: HTTP {response.status if response else 'No response'}")
+
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+            # Fetch through the browser context's request API so the download
+            # carries the session's cookies and headers (auth-gated files)
+            response = await self.context.request.get(url, timeout=60000)
+            if not response.ok:
+                logger.error(f"Failed to download file: HTTP {response.status}")
                 return False
+            body = await response.body()
+            async with aiofiles.open(output_path, 'wb') as f:
+                await f.write(body)
+
+            logger.info(f"File downloaded successfully to {output_path}")
+            return True
         except Exception as e:
             logger.error(f"Error downloading file: {e}")
             return False
@@ -0,0 +1,161 @@
+"""Semantic cache for LLM text analysis calls."""
+
+import asyncio
+import threading
+import orjson
+from pathlib import Path
+from typing import Optional
+
+from src.utils.logger import logger
+from src.solver.llm_client import LLMClient
+
+
+# Cosine similarity above which a stored response is considered a hit
+SIMILARITY_THRESHOLD = 0.92
+
+# Embedding model and its output dimensionality
+EMBED_MODEL = "all-MiniLM-L6-v2"
+EMBED_DIM = 384
+
+# How much of the context participates in the cache key
+MAX_CONTEXT_CHARS = 2000
+
+# Process-wide cache state. The embedding model alone takes seconds and
+# ~100 MB to load, so all SemanticLLMCache instances share one copy of the
+# model, index and response list, guarded by a single lock.
+_LOCK = threading.Lock()
+_MODEL = None
+_INDEX = None
+_RESPONSES: list = []
+_LOAD_FAILED = False
+
+
+def _ensure_loaded(store_path: Path) -> bool:
+    """Load the shared embedding model and persisted entries on first use."""
+    global _MODEL, _INDEX, _RESPONSES, _LOAD_FAILED
+    with _LOCK:
+        if _MODEL is not None:
+            return True
+        if _LOAD_FAILED:
+            return False
+        try:
+            import faiss
+            import numpy as np
+            from sentence_transformers import SentenceTransformer
+
+            _MODEL = SentenceTransformer(EMBED_MODEL)
+            _INDEX = faiss.IndexFlatIP(EMBED_DIM)
+
+            # Each line carries its own vector and response, so the index is
+            # rebuilt from the store and the two can never disagree, even
+            # with several workers appending to the same file
+            if store_path.exists():
+                vectors = []
+                responses = []
+                with open(store_path, 'rb') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        entry = orjson.loads(line)
+                        vectors.append(entry["vector"])
+                        responses.append(entry["response"])
+                if vectors:
+                    _INDEX.add(np.asarray(vectors, dtype='float32'))
+                    _RESPONSES = responses
+                logger.info(f"Loaded semantic cache with {_INDEX.ntotal} entries")
+
+            return True
+        except Exception as e:
+            logger.warning(f"Semantic cache unavailable: {e}")
+            _MODEL = None
+            _LOAD_FAILED = True
+            return False
+
+
+class SemanticLLMCache:
+    """
+    Embedding-based cache wrapped around LLMClient.analyze_text.
+
+    Near-duplicate (prompt, context) pairs — retries, re-visited quiz pages,
+    similar tasks in a chain — return the stored response without a network
+    round trip. Entries persist across processes as one JSONL line per
+    (vector, response) pair under the downloads directory; appends are
+    whole lines, so concurrent workers can share the file safely.
+
+    Instances are cheap: the embedding model, index and responses live at
+    module level and are loaded once per process, off the event loop, the
+    first time any instance needs them. If they cannot be loaded, calls fall
+    through to the LLM directly.
+    """
+
+    def __init__(self, llm_client: LLMClient, cache_dir: str = "downloads"):
+        """
+        Initialize semantic cache.
+
+        Args:
+            llm_client: Client used on cache misses
+            cache_dir: Directory for the persistent entry store
+        """
+        self.llm_client = llm_client
+        self.store_path = Path(cache_dir) / ".llm_cache.jsonl"
+
+    @staticmethod
+    def _embed(prompt: str, context: Optional[str]):
+        """Embed the cache key as a normalized vector."""
+        key = prompt if not context else f"{prompt}\n{context[:MAX_CONTEXT_CHARS]}"
+        return _MODEL.encode([key], normalize_embeddings=True)
+
+    def _persist(self, vector, response: str) -> None:
+        """Append the new entry — vector and response together — to disk."""
+        try:
+            self.store_path.parent.mkdir(parents=True, exist_ok=True)
+            entry = {"vector": vector[0].tolist(), "response": response}
+            with open(self.store_path, 'ab') as f:
+                f.write(orjson.dumps(entry) + b"\n")
+        except Exception as e:
+            logger.warning(f"Failed to persist semantic cache entry: {e}")
+
+    def _store(self, vector, response: str) -> None:
+        """Add a fresh entry to the shared index under the lock."""
+        with _LOCK:
+            _INDEX.add(vector)
+            _RESPONSES.append(response)
+            self._persist(vector, response)
+
+    async def analyze_text(self, prompt: str, context: Optional[str] = None) -> Optional[str]:
+        """
+        Analyze text, serving near-duplicate requests from the cache.
+
+        Args:
+            prompt: The question or task to solve
+            context: Additional context or data
+
+        Returns:
+            Cached or fresh LLM response, None on error
+        """
+        if not await asyncio.to_thread(_ensure_loaded, self.store_path):
+            return await self.llm_client.analyze_text(prompt, context)
+
+        try:
+            # Encoding is CPU-bound; keep it off the event loop
+            vector = await asyncio.to_thread(self._embed, prompt, context)
+            with _LOCK:
+                hit_id = None
+                if _INDEX.ntotal:
+                    scores, ids = _INDEX.search(vector, 1)
+                    if scores[0][0] >= SIMILARITY_THRESHOLD:
+                        hit_id = ids[0][0]
+                        similarity = scores[0][0]
+            if hit_id is not None:
+                logger.info(f"Semantic cache hit (similarity: {similarity:.3f})")
+                return _RESPONSES[hit_id]
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return await self.llm_client.analyze_text(prompt, context)
+
+        response = await self.llm_client.analyze_text(prompt, context)
+
+        if response:
+            await asyncio.to_thread(self._store, vector, response)
+
+        return response
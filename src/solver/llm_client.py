@@ -1,6 +1,11 @@
 """OpenAI LLM client for quiz solving."""
 
+import aiofiles
+import httpx
 import openai
+import orjson
+import re
+from async_lru import alru_cache
 from typing import Optional, List, Dict, Any
 import base64
 from pathlib import Path
@@ -9,56 +14,104 @@ from src.config import settings
 from src.utils.logger import logger
 
 
+# Matches a JSON object inside a markdown code fence
+_JSON_BLOCK_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+
+# Fixed system preamble; keeping it identical across calls lets the provider
+# cache the prompt prefix
+_SYSTEM_TEMPLATE = "You are a helpful assistant that solves data analysis tasks. Provide concise, accurate answers."
+
+
 class LLMClient:
     """Client for interacting with OpenAI's API."""
-    
+
+    __slots__ = ("client", "model")
+
+    # One pooled transport shared by every instance, so all handlers reuse
+    # the same keep-alive connections
+    _http_client: Optional[httpx.AsyncClient] = None
+
     def __init__(self):
         """Initialize OpenAI client."""
-        openai.api_key = settings.openai_api_key
-        self.client = openai.OpenAI(api_key=settings.openai_api_key)
+        if LLMClient._http_client is None:
+            LLMClient._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        self.client = openai.AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=LLMClient._http_client
+        )
         self.model = "gpt-4o"  # Using GPT-4 Turbo for better performance
-    
+
+    @alru_cache(maxsize=512)
+    async def _cached_completion(
+        self,
+        model: str,
+        system: Optional[str],
+        static_context: Optional[str],
+        dynamic_question: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """
+        Issue a chat completion, memoizing identical calls.
+
+        Quiz chains and retries often repeat the exact same (prompt, context)
+        pair; cache hits skip the network round trip entirely. Errors raise
+        so failures are never cached.
+
+        The static system/context messages come before the variable question
+        so the provider's prefix cache can reuse them when the same page is
+        queried again.
+        """
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        if static_context:
+            messages.append({"role": "user", "content": static_context})
+        messages.append({"role": "user", "content": dynamic_question})
+
+        response = await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        return response.choices[0].message.content
+
     async def analyze_text(self, prompt: str, context: Optional[str] = None) -> Optional[str]:
         """
         Analyze text using GPT-4.
-        
+
         Args:
             prompt: The question or task to solve
             context: Additional context or data
-            
+
         Returns:
             LLM response or None if error
         """
         try:
-            messages = []
-            
             if context:
-                messages.append({
-                    "role": "system",
-                    "content": "You are a helpful assistant that solves data analysis tasks. Provide concise, accurate answers."
-                })
-                messages.append({
-                    "role": "user",
-                    "content": f"Context:\n{context}\n\nTask:\n{prompt}"
-                })
+                system = _SYSTEM_TEMPLATE
+                static_context = f"Context:\n{context}"
+                question = f"Task:\n{prompt}"
             else:
-                messages.append({
-                    "role": "user",
-                    "content": prompt
-                })
-            
+                system = None
+                static_context = None
+                question = prompt
+
             logger.info(f"Sending request to OpenAI (model: {self.model})")
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.1,  # Low temperature for more deterministic answers
-                max_tokens=2000
+
+            answer = await self._cached_completion(
+                self.model,
+                system,
+                static_context,
+                question,
+                0.1,  # Low temperature for more deterministic answers
+                2000
             )
-            
-            answer = response.choices[0].message.content
             logger.info(f"Received response from OpenAI (length: {len(answer)})")
-            
+
             return answer
         except Exception as e:
             logger.error(f"Error calling OpenAI API: {e}")
@@ -76,10 +129,12 @@ class LLMClient:
             LLM response or None if error
         """
         try:
-            # Read and encode image
-            with open(image_path, 'rb') as f:
-                image_data = base64.b64encode(f.read()).decode('utf-8')
-            
+            # Read asynchronously and keep the base64 payload as bytes until
+            # it is interpolated into the data URL
+            async with aiofiles.open(image_path, 'rb') as f:
+                raw = await f.read()
+            image_data = base64.b64encode(raw)
+
             # Determine image type
             ext = Path(image_path).suffix.lower()
             mime_type = {
@@ -92,7 +147,7 @@ class LLMClient:
             
             logger.info(f"Analyzing image: {image_path}")
             
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4o",  # Vision model
                 messages=[
                     {
@@ -102,7 +157,7 @@ class LLMClient:
                             {
                                 "type": "image_url",
                                 "image_url": {
-                                    "url": f"data:{mime_type};base64,{image_data}"
+                                    "url": f"data:{mime_type};base64,{image_data.decode('ascii')}"
                                 }
                             }
                         ]
@@ -146,24 +201,23 @@ Text:
             response = await self.analyze_text(prompt)
             
             if response:
-                # Try to parse JSON from response
-                import json
-                import re
-                
-                # Extract JSON from markdown code blocks if present
-                json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(1)
-                else:
-                    json_str = response
-                
+                # Fast path: the whole response is bare JSON
                 try:
-                    data = json.loads(json_str)
-                    return data
-                except json.JSONDecodeError:
-                    logger.warning("Failed to parse JSON from LLM response")
-                    return None
-            
+                    return orjson.loads(response)
+                except orjson.JSONDecodeError:
+                    pass
+
+                # Fall back to a markdown code block if present
+                json_match = _JSON_BLOCK_RE.search(response)
+                if json_match:
+                    try:
+                        return orjson.loads(json_match.group(1))
+                    except orjson.JSONDecodeError:
+                        pass
+
+                logger.warning("Failed to parse JSON from LLM response")
+                return None
+
             return None
         except Exception as e:
             logger.error(f"Error extracting structured data: {e}")
@@ -1,12 +1,16 @@
 """Main quiz solver orchestrator."""
 
 import asyncio
+import hashlib
 import re
-import json
+import orjson
+from functools import lru_cache
 from typing import Optional, Dict, Any
+from urllib.parse import urljoin
 from pathlib import Path
+import aiofiles
 import httpx
-from bs4 import BeautifulSoup
+from selectolax.parser import HTMLParser
 
 from src.utils.logger import logger
 from src.utils.helpers import Timer, get_payload_size
@@ -24,21 +28,78 @@ from src.solver.task_handlers import (
 from src.api.models import SubmitRequest, SubmitResponse
 
 
+# Hot patterns, compiled once per process
+_SUBMIT_RE = re.compile(r'https?://[^\s<>"]+/submit[^\s<>"]*')
+_PAGE_RE = re.compile(r'page\s+(\d+)', re.I)
+_FILE_EXT_RE = re.compile(r'\.(?:pdf|csv|json|xlsx|txt)(?:$|[?#])', re.I)
+
+# LLM task extractions memoized by page-content hash, so retried pages in a
+# chain cost nothing
+_TASK_DESC_CACHE: Dict[str, str] = {}
+
+# Maps downloaded-file extensions to the handler that consumes them
+_EXT_HANDLER = {'.pdf': 'pdf', '.csv': 'analysis', '.json': 'analysis', '.xlsx': 'analysis'}
+
+
+@lru_cache(maxsize=4096)
+def _has_data_ext(href: str) -> bool:
+    """Whether an href points at a data file; memoized since quiz pages
+    repeat the same hrefs across retries and chains."""
+    return _FILE_EXT_RE.search(href) is not None
+
+
 class QuizSolver:
     """Main orchestrator for solving quiz tasks."""
-    
-    def __init__(self):
-        """Initialize quiz solver."""
+
+    # One pooled HTTP client shared by every solver, so successive
+    # submissions reuse keep-alive connections to the quiz server
+    _submit_client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def _get_submit_client(cls) -> httpx.AsyncClient:
+        """Return the shared submit client, creating it on first use."""
+        if cls._submit_client is None:
+            cls._submit_client = httpx.AsyncClient(
+                http2=True,
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=8)
+            )
+        return cls._submit_client
+
+    @classmethod
+    async def close_submit_client(cls):
+        """Close the shared submit client, typically at server shutdown."""
+        if cls._submit_client is not None:
+            await cls._submit_client.aclose()
+            cls._submit_client = None
+
+    def __init__(self, browser=None):
+        """
+        Initialize quiz solver.
+
+        Args:
+            browser: Optional shared Playwright browser to reuse instead of
+                launching a fresh one per page fetch
+        """
+        self.shared_browser = browser
+        self.browser: Optional[BrowserHandler] = None
+        self._page_warm = False
         self.llm_client = LLMClient()
         self.handlers = {
-            'scraping': DataScrapingHandler(),
-            'pdf': PDFProcessingHandler(),
-            'analysis': DataAnalysisHandler(),
-            'api': APIHandler(),
-            'visualization': VisualizationHandler(),
-            'general': GeneralTaskHandler()
+            'scraping': DataScrapingHandler(self.llm_client),
+            'pdf': PDFProcessingHandler(self.llm_client),
+            'analysis': DataAnalysisHandler(self.llm_client),
+            'api': APIHandler(self.llm_client),
+            'visualization': VisualizationHandler(self.llm_client),
+            'general': GeneralTaskHandler(self.llm_client)
         }
-    
+
+    def _browser_handler(self) -> BrowserHandler:
+        """Build a browser handler, reusing the shared browser when available."""
+        if self.shared_browser is not None:
+            return BrowserHandler.from_shared(self.shared_browser)
+        return BrowserHandler()
+
     async def solve_quiz_chain(self, initial_url: str, email: str, secret: str):
         """
         Solve a chain of quiz tasks.
@@ -50,31 +111,37 @@ class QuizSolver:
         """
         current_url = initial_url
         quiz_count = 0
-        
-        with Timer(timeout_seconds=settings.timeout_seconds) as timer:
-            while current_url and not timer.is_timeout():
-                quiz_count += 1
-                logger.info(f"Solving quiz #{quiz_count}: {current_url}")
-                logger.info(f"Time remaining: {timer.remaining():.1f}s")
-                
-                # Solve the quiz
-                next_url = await self.solve_single_quiz(
-                    quiz_url=current_url,
-                    email=email,
-                    secret=secret,
-                    time_remaining=timer.remaining()
-                )
-                
-                if next_url:
-                    current_url = next_url
-                else:
-                    logger.info("Quiz chain completed or no more URLs")
-                    break
-            
-            if timer.is_timeout():
-                logger.warning("Quiz chain timed out")
-            else:
-                logger.info(f"Successfully completed {quiz_count} quizzes")
+
+        # One browser session per chain; each quiz reuses its context
+        async with self._browser_handler() as self.browser:
+            try:
+                with Timer(timeout_seconds=settings.timeout_seconds) as timer:
+                    while current_url and not timer.is_timeout():
+                        quiz_count += 1
+                        remaining = timer.remaining()
+                        logger.info(f"Solving quiz #{quiz_count}: {current_url}")
+                        logger.info(f"Time remaining: {remaining:.1f}s")
+
+                        # Solve the quiz
+                        next_url = await self.solve_single_quiz(
+                            quiz_url=current_url,
+                            email=email,
+                            secret=secret,
+                            time_remaining=remaining
+                        )
+
+                        if next_url:
+                            current_url = next_url
+                        else:
+                            logger.info("Quiz chain completed or no more URLs")
+                            break
+
+                    if timer.is_timeout():
+                        logger.warning("Quiz chain timed out")
+                    else:
+                        logger.info(f"Successfully completed {quiz_count} quizzes")
+            finally:
+                self.browser = None
     
     async def solve_single_quiz(
         self,
@@ -124,14 +191,25 @@ class QuizSolver:
                 logger.error("No submit URL found")
                 return None
             
-            response = await self.submit_answer(
+            submit_task = asyncio.create_task(self.submit_answer(
                 submit_url=submit_url,
                 email=email,
                 secret=secret,
                 quiz_url=quiz_url,
                 answer=answer
-            )
-            
+            ))
+
+            # While the submission round trip is in flight, warm a fresh page
+            # so the next quiz in the chain skips page-creation latency
+            if self.browser is not None:
+                try:
+                    await self.browser.new_page()
+                    self._page_warm = True
+                except Exception as e:
+                    logger.warning(f"Page warm-up failed: {e}")
+
+            response = await submit_task
+
             if response:
                 if response.correct:
                     logger.info("Answer was CORRECT!")
@@ -156,27 +234,48 @@ class QuizSolver:
             Dictionary with page content and metadata
         """
         try:
-            async with BrowserHandler() as browser:
-                success = await browser.navigate_to(url)
-                if not success:
-                    return None
-                
-                # Extract quiz instructions
-                content = await browser.extract_quiz_instructions()
-                if not content:
-                    return None
-                
-                # Get full HTML for link extraction
-                full_html = await browser.get_page_content()
-                
-                return {
-                    'content': content,
-                    'html': full_html,
-                    'url': url
-                }
+            if self.browser is not None:
+                # Chain browser is running: use a fresh page in its context,
+                # unless one was already warmed during the last submission
+                if not self._page_warm:
+                    await self.browser.new_page()
+                self._page_warm = False
+                return await self._extract_page(self.browser, url)
+
+            async with self._browser_handler() as browser:
+                return await self._extract_page(browser, url)
         except Exception as e:
             logger.error(f"Error fetching quiz page: {e}")
             return None
+
+    async def _extract_page(self, browser: BrowserHandler, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Navigate to a quiz URL and extract its content.
+
+        Args:
+            browser: Browser handler with an open page
+            url: Quiz URL
+
+        Returns:
+            Dictionary with page content and metadata, or None
+        """
+        success = await browser.navigate_to(url, wait_for_result=True)
+        if not success:
+            return None
+
+        # Extract quiz instructions
+        content = await browser.extract_quiz_instructions()
+        if not content:
+            return None
+
+        # Get full HTML for link extraction
+        full_html = await browser.get_page_content()
+
+        return {
+            'content': content,
+            'html': full_html,
+            'url': url
+        }
     
     async def parse_quiz_task(self, quiz_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -191,31 +290,58 @@ class QuizSolver:
         try:
             content = quiz_data['content']
             html = quiz_data['html']
-            
-            # Parse HTML
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Extract text content
-            text_content = soup.get_text(separator='\n', strip=True)
-            
-            # Find submit URL
+
+            # content is already plain text; parse the full page for links
+            text_content = content.strip()
+
+            # Collect submit URL and data file URLs in a single pass over the
+            # anchors, falling back to BeautifulSoup only if parsing fails
             submit_url = None
-            submit_match = re.search(r'https?://[^\s<>"]+/submit[^\s<>"]*', content)
-            if submit_match:
-                submit_url = submit_match.group(0)
-            
-            # Find data file URLs
             file_urls = []
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if any(ext in href for ext in ['.pdf', '.csv', '.json', '.xlsx', '.txt']):
+            tree = None
+            try:
+                tree = HTMLParser(html)
+                hrefs = [a.attributes.get('href', '') for a in tree.css('a[href]')]
+            except Exception:
+                from bs4 import BeautifulSoup
+                soup = BeautifulSoup(html, 'html.parser')
+                hrefs = [link['href'] for link in soup.find_all('a', href=True)]
+            page_url = quiz_data['url']
+            for href in hrefs:
+                # Anchors are often relative; resolve against the page URL so
+                # downstream httpx calls always get absolute URLs
+                href = urljoin(page_url, href)
+                if submit_url is None and '/submit' in href:
+                    submit_url = href
+                if _has_data_ext(href):
                     file_urls.append(href)
-            
-            # Use LLM to understand the task
-            task_description = await self.llm_client.analyze_text(
-                prompt="Extract the main question or task from this quiz. Be concise and specific.",
-                context=text_content
-            )
+
+            # Submit URL may only appear as plain text on the page
+            if submit_url is None:
+                submit_match = _SUBMIT_RE.search(html)
+                if submit_match:
+                    submit_url = submit_match.group(0)
+            
+            # Prefer the page's own question block over an LLM rephrase
+            task_description = None
+            if tree is not None:
+                heading = tree.css_first('h1, h2, .question, [data-question]')
+                if heading:
+                    heading_text = heading.text(strip=True)
+                    if 20 <= len(heading_text) <= 500:
+                        task_description = heading_text
+
+            # Fall back to the LLM, memoized by content hash
+            if task_description is None:
+                content_key = hashlib.sha256(text_content.encode()).hexdigest()
+                task_description = _TASK_DESC_CACHE.get(content_key)
+                if task_description is None:
+                    task_description = await self.llm_client.analyze_text(
+                        prompt="Extract the main question or task from this quiz. Be concise and specific.",
+                        context=text_content
+                    )
+                    if task_description:
+                        _TASK_DESC_CACHE[content_key] = task_description
             
             return {
                 'task_description': task_description or text_content,
@@ -243,13 +369,19 @@ class QuizSolver:
             raw_content = task_info['raw_content']
             file_urls = task_info.get('file_urls', [])
             
-            # Download files if any
+            # Download files concurrently over plain HTTP
             downloaded_files = []
             if file_urls:
-                for file_url in file_urls:
-                    file_path = await self.download_file(file_url)
-                    if file_path:
-                        downloaded_files.append(file_path)
+                async with httpx.AsyncClient(
+                    follow_redirects=True,
+                    http2=True,
+                    limits=httpx.Limits(max_connections=16),
+                    timeout=60.0
+                ) as client:
+                    results = await asyncio.gather(
+                        *[self._download_http(url, client) for url in file_urls]
+                    )
+                downloaded_files = [f for f in results if f]
             
             # Determine task type and use appropriate handler
             context = {
@@ -258,29 +390,33 @@ class QuizSolver:
                 'files': downloaded_files
             }
             
-            # Check if PDF processing is needed
-            if downloaded_files and any(str(f).endswith('.pdf') for f in downloaded_files):
-                pdf_file = next(f for f in downloaded_files if str(f).endswith('.pdf'))
-                
+            # Resolve the handler in a single pass over the downloads instead
+            # of re-scanning the list once per file type
+            matched: Dict[str, Path] = {}
+            for f in downloaded_files:
+                key = _EXT_HANDLER.get(Path(f).suffix.lower())
+                if key and key not in matched:
+                    matched[key] = Path(f)
+
+            if 'pdf' in matched:
                 # Extract page number if mentioned
-                page_match = re.search(r'page\s+(\d+)', raw_content, re.IGNORECASE)
+                page_match = _PAGE_RE.search(raw_content)
                 page_num = int(page_match.group(1)) if page_match else None
-                
+
                 return await self.handlers['pdf'].handle(
                     task_description,
-                    {'pdf_path': pdf_file, 'page_number': page_num}
+                    {'pdf_path': matched['pdf'], 'page_number': page_num}
                 )
-            
-            # Check if CSV/data analysis is needed
-            elif downloaded_files and any(str(f).endswith(('.csv', '.json')) for f in downloaded_files):
-                data_file = downloaded_files[0]
-                data_type = 'csv' if str(data_file).endswith('.csv') else 'json'
-                
+
+            elif 'analysis' in matched:
+                data_file = matched['analysis']
+                data_type = {'.csv': 'csv', '.json': 'json'}.get(data_file.suffix.lower(), 'excel')
+
                 return await self.handlers['analysis'].handle(
                     task_description,
                     {'data': str(data_file), 'data_type': data_type}
                 )
-            
+
             # Use general handler for other tasks
             else:
                 return await self.handlers['general'].handle(
@@ -291,31 +427,108 @@ class QuizSolver:
             logger.error(f"Error solving task: {e}")
             return None
     
+    @staticmethod
+    def _cache_path(url: str) -> Path:
+        """
+        Content-addressed destination for a download URL.
+
+        Each URL hashes to its own subdirectory, so repeated quizzes that
+        reference the same file skip the download entirely while distinct
+        URLs with the same filename never collide.
+
+        Args:
+            url: File URL
+
+        Returns:
+            Destination path under the downloads directory
+        """
+        key = hashlib.sha1(url.encode()).hexdigest()[:16]
+        filename = url.split('/')[-1].split('?')[0] or 'download'
+        file_path = Path("downloads") / key / filename
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        return file_path
+
+    async def _download_http(self, url: str, client: httpx.AsyncClient) -> Optional[Path]:
+        """
+        Download a file over plain HTTP, streaming it to disk.
+
+        Args:
+            url: File URL
+            client: Shared pooled HTTP client
+
+        Returns:
+            Path to downloaded file, or None on failure
+        """
+        try:
+            file_path = self._cache_path(url)
+            if file_path.exists() and file_path.stat().st_size > 0:
+                logger.info(f"Using cached download for {url}")
+                return file_path
+
+            # Write to a .part file and rename on success, so a partial
+            # download is never mistaken for a cache hit
+            part_path = file_path.with_suffix(file_path.suffix + '.part')
+            async with client.stream("GET", url) as response:
+                if response.status_code in (401, 403):
+                    # Auth-gated URL: fall back to the browser session
+                    return await self.download_file(url)
+                if response.status_code >= 400:
+                    logger.error(f"Download failed: HTTP {response.status_code} for {url}")
+                    return None
+                async with aiofiles.open(part_path, 'wb') as f:
+                    async for chunk in response.aiter_bytes(65536):
+                        await f.write(chunk)
+            part_path.rename(file_path)
+
+            return file_path
+        except Exception as e:
+            logger.error(f"Error downloading file: {e}")
+            return None
+
     async def download_file(self, url: str) -> Optional[Path]:
         """
         Download a file from URL.
-        
+
         Args:
             url: File URL
-            
+
         Returns:
             Path to downloaded file or None
         """
         try:
-            # Create downloads directory
-            download_dir = Path("downloads")
-            download_dir.mkdir(exist_ok=True)
-            
-            # Extract filename
-            filename = url.split('/')[-1].split('?')[0]
-            file_path = download_dir / filename
-            
-            # Download using browser handler
-            async with BrowserHandler() as browser:
-                success = await browser.download_file(url, str(file_path))
-                if success:
+            file_path = self._cache_path(url)
+            if file_path.exists() and file_path.stat().st_size > 0:
+                logger.info(f"Using cached download for {url}")
+                return file_path
+
+            part_path = file_path.with_suffix(file_path.suffix + '.part')
+
+            # Most quiz assets are plain static files; try a direct GET
+            # before involving the browser at all
+            try:
+                async with httpx.AsyncClient(follow_redirects=True, timeout=60.0) as client:
+                    response = await client.get(url)
+                if (response.status_code < 400
+                        and 'html' not in response.headers.get('content-type', '')):
+                    async with aiofiles.open(part_path, 'wb') as f:
+                        await f.write(response.content)
+                    part_path.rename(file_path)
                     return file_path
-            
+                logger.info(f"Direct download rejected for {url}, falling back to browser")
+            except Exception as e:
+                logger.info(f"Direct download failed for {url}, falling back to browser: {e}")
+
+            # Download using the chain browser when available
+            if self.browser is not None:
+                success = await self.browser.download_file(url, str(part_path))
+            else:
+                async with self._browser_handler() as browser:
+                    success = await browser.download_file(url, str(part_path))
+
+            if success:
+                part_path.rename(file_path)
+                return file_path
+
             return None
         except Exception as e:
             logger.error(f"Error downloading file: {e}")
@@ -351,8 +564,12 @@ class QuizSolver:
                 "answer": answer
             }
             
-            # Check payload size
-            payload_size = get_payload_size(payload)
+            # Check payload size; estimate data-URI answers without
+            # serializing the whole payload
+            if isinstance(answer, str) and answer.startswith('data:image'):
+                payload_size = len(answer) + 128
+            else:
+                payload_size = get_payload_size(payload)
             if payload_size > settings.max_payload_size:
                 logger.error(f"Payload too large: {payload_size} bytes")
                 return None
@@ -360,17 +577,20 @@ class QuizSolver:
             logger.info(f"Submitting answer to {submit_url}")
             logger.info(f"Payload size: {payload_size} bytes")
             
-            # Submit
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(submit_url, json=payload)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    return SubmitResponse(**data)
-                else:
-                    logger.error(f"Submit failed: HTTP {response.status_code}")
-                    logger.error(f"Response: {response.text}")
-                    return None
+            # Submit over the shared pooled client
+            response = await self._get_submit_client().post(
+                submit_url,
+                content=orjson.dumps(payload),
+                headers={'content-type': 'application/json'}
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                return SubmitResponse(**data)
+            else:
+                logger.error(f"Submit failed: HTTP {response.status_code}")
+                logger.error(f"Response: {response.text}")
+                return None
         except Exception as e:
             logger.error(f"Error submitting answer: {e}")
             return None
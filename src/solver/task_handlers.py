@@ -1,25 +1,47 @@
 """Task handlers for different types of quiz questions."""
 
+import base64
+import hashlib
+import io
 import re
 import json
+import threading
 from typing import Any, Optional, Dict, List
 from pathlib import Path
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
 import pandas as pd
 from bs4 import BeautifulSoup
 import httpx
-from PyPDF2 import PdfReader
+import pypdfium2 as pdfium
 
 from src.utils.logger import logger
+from src.utils.helpers import fit_to_tokens
 from src.solver.llm_client import LLMClient
+from src.solver.llm_cache import SemanticLLMCache
 from src.solver.browser_handler import BrowserHandler
 
 
+# Reusable figure for chart rendering; creating a figure per call is the
+# dominant matplotlib cost. Guarded by a lock since pyplot is not thread-safe.
+_FIG_LOCK = threading.Lock()
+_FIG = None
+_AX = None
+
+
 class TaskHandler:
     """Base class for task handlers."""
-    
-    def __init__(self):
-        """Initialize task handler."""
-        self.llm_client = LLMClient()
+
+    def __init__(self, llm_client: LLMClient):
+        """
+        Initialize task handler.
+
+        Args:
+            llm_client: Shared LLM client injected by the solver
+        """
+        self.llm_client = llm_client
+        self.llm_cache = SemanticLLMCache(llm_client)
     
     async def handle(self, task_description: str, context: Dict[str, Any]) -> Any:
         """
@@ -50,10 +72,11 @@ class DataScrapingHandler(TaskHandler):
                 await browser.navigate_to(url)
                 content = await browser.get_page_content()
                 
-                # Use LLM to extract the required information
-                answer = await self.llm_client.analyze_text(
+                # Use LLM to extract the required information; trim by token
+                # budget rather than a blind character cut
+                answer = await self.llm_cache.analyze_text(
                     prompt=task_description,
-                    context=f"HTML Content:\n{content[:10000]}"  # Limit context size
+                    context=f"HTML Content:\n{fit_to_tokens(content, 6000)}"
                 )
                 
                 return answer
@@ -64,7 +87,52 @@ class DataScrapingHandler(TaskHandler):
 
 class PDFProcessingHandler(TaskHandler):
     """Handler for PDF processing tasks."""
-    
+
+    # Stop accumulating page text past this point; the LLM context is bounded
+    MAX_CHARS = 120_000
+
+    # Extracted text persists here, keyed by (pdf_path, page_number)
+    CACHE_DIR = Path("downloads") / ".pdf_text_cache"
+
+    @classmethod
+    def _extract_text(cls, pdf_path: Any, page_num: Optional[int]) -> str:
+        """
+        Extract PDF text with pdfium, caching results on disk.
+
+        Args:
+            pdf_path: Path to the PDF file
+            page_num: 1-based page number, or None for all pages
+
+        Returns:
+            Extracted text
+        """
+        key = hashlib.sha1(f"{pdf_path}:{page_num}".encode()).hexdigest()[:16]
+        cache_file = cls.CACHE_DIR / f"{key}.txt"
+        if cache_file.exists():
+            return cache_file.read_text()
+
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            if page_num:
+                text = pdf[page_num - 1].get_textpage().get_text_bounded()
+            else:
+                # Extract lazily and stop once the context budget is filled
+                parts = []
+                total = 0
+                for page in pdf:
+                    page_text = page.get_textpage().get_text_bounded()
+                    parts.append(page_text)
+                    total += len(page_text)
+                    if total > cls.MAX_CHARS:
+                        break
+                text = "\n".join(parts)
+        finally:
+            pdf.close()
+
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(text)
+        return text
+
     async def handle(self, task_description: str, context: Dict[str, Any]) -> Any:
         """Process PDF files."""
         try:
@@ -72,23 +140,17 @@ class PDFProcessingHandler(TaskHandler):
             if not pdf_path:
                 logger.error("No PDF path provided")
                 return None
-            
-            # Read PDF
-            reader = PdfReader(pdf_path)
-            
+
             # Extract text from all pages or specific page
             page_num = context.get('page_number')
-            if page_num:
-                text = reader.pages[page_num - 1].extract_text()
-            else:
-                text = "\n".join([page.extract_text() for page in reader.pages])
-            
+            text = self._extract_text(pdf_path, page_num)
+
             logger.info(f"Extracted {len(text)} characters from PDF")
             
-            # Use LLM to analyze the PDF content
-            answer = await self.llm_client.analyze_text(
+            # Use LLM to analyze the PDF content within a fixed token budget
+            answer = await self.llm_cache.analyze_text(
                 prompt=task_description,
-                context=f"PDF Content:\n{text}"
+                context=f"PDF Content:\n{fit_to_tokens(text, 6000)}"
             )
             
             return answer
@@ -99,17 +161,33 @@ class PDFProcessingHandler(TaskHandler):
 
 class DataAnalysisHandler(TaskHandler):
     """Handler for data analysis tasks."""
-    
+
+    @staticmethod
+    def _summarize(df: pd.DataFrame) -> str:
+        """Build a compact summary of a DataFrame for the LLM context."""
+        return (
+            f"Schema:\n{df.dtypes.to_string()}\n"
+            f"Rows: {len(df)}\n"
+            f"Head:\n{df.head(20).to_csv(index=False)}\n"
+            f"Tail:\n{df.tail(5).to_csv(index=False)}\n"
+            f"Numeric summary:\n{df.describe().to_string()}"
+        )
+
     async def handle(self, task_description: str, context: Dict[str, Any]) -> Any:
-        """Analyze data (CSV, JSON, tables, etc.)."""
+        """Analyze data (CSV, JSON, Excel, tables, etc.)."""
         try:
             data = context.get('data')
             data_type = context.get('data_type', 'text')
-            
+
             if data_type == 'csv':
-                # Parse CSV data
-                df = pd.read_csv(data) if isinstance(data, str) and Path(data).exists() else pd.read_csv(pd.io.common.StringIO(data))
-                data_str = df.to_string()
+                # Parse CSV with the Arrow engine and send a compact summary
+                # instead of stringifying every cell
+                source = data if isinstance(data, str) and Path(data).exists() else pd.io.common.StringIO(data)
+                df = pd.read_csv(source, engine='pyarrow', dtype_backend='pyarrow')
+                data_str = self._summarize(df)
+            elif data_type == 'excel':
+                df = pd.read_excel(data)
+                data_str = self._summarize(df)
             elif data_type == 'json':
                 # Parse JSON data
                 data_obj = json.loads(data) if isinstance(data, str) else data
@@ -153,7 +231,7 @@ class APIHandler(TaskHandler):
                     content = response.text
                     
                     # Use LLM to extract answer from API response
-                    answer = await self.llm_client.analyze_text(
+                    answer = await self.llm_cache.analyze_text(
                         prompt=task_description,
                         context=f"API Response:\n{content}"
                     )
@@ -172,36 +250,41 @@ class VisualizationHandler(TaskHandler):
     
     async def handle(self, task_description: str, context: Dict[str, Any]) -> Any:
         """Generate visualizations."""
+        global _FIG, _AX
         try:
-            import matplotlib.pyplot as plt
-            import io
-            import base64
-            
             data = context.get('data')
             chart_type = context.get('chart_type', 'bar')
-            
-            # Create figure
-            fig, ax = plt.subplots(figsize=(10, 6))
-            
-            # Generate chart based on type
-            if chart_type == 'bar':
-                if isinstance(data, dict):
-                    ax.bar(data.keys(), data.values())
-            elif chart_type == 'line':
-                if isinstance(data, dict):
-                    ax.plot(list(data.keys()), list(data.values()))
-            
-            ax.set_title(context.get('title', 'Chart'))
-            ax.set_xlabel(context.get('xlabel', 'X'))
-            ax.set_ylabel(context.get('ylabel', 'Y'))
-            
-            # Save to base64
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
+
+            with _FIG_LOCK:
+                # Create the figure once and clear it between calls
+                if _FIG is None:
+                    _FIG, _AX = plt.subplots(figsize=(10, 6))
+                _AX.clear()
+
+                # Generate chart based on type
+                if chart_type == 'bar':
+                    if isinstance(data, dict):
+                        _AX.bar(data.keys(), data.values())
+                elif chart_type == 'line':
+                    if isinstance(data, dict):
+                        _AX.plot(list(data.keys()), list(data.values()))
+
+                _AX.set_title(context.get('title', 'Chart'))
+                _AX.set_xlabel(context.get('xlabel', 'X'))
+                _AX.set_ylabel(context.get('ylabel', 'Y'))
+
+                # Save to base64 at the default DPI; higher resolutions are
+                # opt-in via context
+                buffer = io.BytesIO()
+                _FIG.savefig(
+                    buffer,
+                    format='png',
+                    dpi=context.get('dpi'),
+                    bbox_inches='tight'
+                )
             buffer.seek(0)
             image_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-            plt.close()
-            
+
             # Return as data URI
             return f"data:image/png;base64,{image_base64}"
         except Exception as e:
@@ -218,7 +301,7 @@ class GeneralTaskHandler(TaskHandler):
             # Combine all context into a string
             context_str = "\n".join([f"{k}: {v}" for k, v in context.items() if v])
             
-            answer = await self.llm_client.analyze_text(
+            answer = await self.llm_cache.analyze_text(
                 prompt=task_description,
                 context=context_str if context_str else None
             )
@@ -1,8 +1,11 @@
 """Utility helper functions."""
 
 import base64
+import io
 import json
+import orjson
 import time
+from functools import lru_cache
 from typing import Any, Dict
 from pathlib import Path
 
@@ -23,18 +26,19 @@ class Timer:
     
     def __enter__(self):
         """Start the timer."""
-        self.start_time = time.time()
+        # Monotonic clock: immune to NTP adjustments and wall-clock jumps
+        self.start_time = time.monotonic()
         return self
-    
+
     def __exit__(self, *args):
         """Stop the timer."""
-        self.end_time = time.time()
-    
+        self.end_time = time.monotonic()
+
     def elapsed(self) -> float:
         """Get elapsed time in seconds."""
         if self.start_time is None:
             return 0.0
-        current = self.end_time if self.end_time else time.time()
+        current = self.end_time if self.end_time else time.monotonic()
         return current - self.start_time
     
     def is_timeout(self) -> bool:
@@ -46,13 +50,66 @@ class Timer:
         return max(0.0, self.timeout_seconds - self.elapsed())
 
 
+# Loaded on first use; False means tiktoken is unavailable and the
+# character-based fallback applies
+_TOKEN_ENCODER = None
+
+
+def fit_to_tokens(text: str, budget: int) -> str:
+    """
+    Trim text to roughly a token budget, keeping the head and the tail.
+
+    The first three quarters of the budget go to the start of the text and
+    the last quarter to the end, with a truncation marker in between, since
+    instructions usually lead and totals/answers often trail.
+
+    Args:
+        text: Text to trim
+        budget: Maximum number of tokens to keep
+
+    Returns:
+        Text fitting within the budget
+    """
+    global _TOKEN_ENCODER
+    if _TOKEN_ENCODER is None:
+        try:
+            import tiktoken
+            # Ask for the gpt-4o tokenizer by encoding name rather than
+            # model name, so older model maps can't break the lookup
+            _TOKEN_ENCODER = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            _TOKEN_ENCODER = False
+
+    if _TOKEN_ENCODER is False:
+        # Approximate 4 characters per token when tiktoken is unavailable
+        limit = budget * 4
+        if len(text) <= limit:
+            return text
+        head = (limit * 3) // 4
+        tail = limit - head
+        return f"{text[:head]}\n…[truncated]…\n{text[-tail:]}"
+
+    tokens = _TOKEN_ENCODER.encode(text)
+    if len(tokens) <= budget:
+        return text
+    head = (budget * 3) // 4
+    tail = budget - head
+    return (
+        f"{_TOKEN_ENCODER.decode(tokens[:head])}"
+        f"\n…[truncated]…\n"
+        f"{_TOKEN_ENCODER.decode(tokens[-tail:])}"
+    )
+
+
+@lru_cache(maxsize=1024)
 def validate_json(data: str) -> bool:
     """
-    Validate if a string is valid JSON.
-    
+    Validate if a string is valid JSON. Memoized, since the same payloads
+    are revalidated across retries.
+
     Args:
         data: String to validate
-        
+
     Returns:
         True if valid JSON, False otherwise
     """
@@ -73,47 +130,54 @@ def get_payload_size(data: Dict[str, Any]) -> int:
     Returns:
         Size in bytes
     """
-    return len(json.dumps(data).encode('utf-8'))
+    return len(orjson.dumps(data))
 
 
 def encode_file_to_base64(file_path: str) -> str:
     """
-    Encode a file to base64 string.
-    
+    Encode a file to base64 string, streaming it in chunks.
+
     Args:
         file_path: Path to file
-        
+
     Returns:
         Base64 encoded string
     """
+    buf = io.BytesIO()
+    # 57 KiB is a multiple of 3, so chunk boundaries align with base64
     with open(file_path, 'rb') as f:
-        return base64.b64encode(f.read()).decode('utf-8')
+        while chunk := f.read(57 * 1024):
+            buf.write(base64.b64encode(chunk))
+    return buf.getvalue().decode('ascii')
 
 
 def decode_base64_to_file(base64_str: str, output_path: str) -> None:
     """
-    Decode base64 string and save to file.
-    
+    Decode base64 string and save to file, streaming it in chunks.
+
     Args:
         base64_str: Base64 encoded string
         output_path: Path to save decoded file
     """
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
     with open(output_path, 'wb') as f:
-        f.write(base64.b64decode(base64_str))
+        # 76 KiB of base64 text is a multiple of 4, so chunks decode cleanly
+        for i in range(0, len(base64_str), 76 * 1024):
+            f.write(base64.b64decode(base64_str[i:i + 76 * 1024]))
+
+
+# Translation table for invalid filename characters, built once
+_SANITIZE_TABLE = str.maketrans({char: '_' for char in '<>:"/\\|?*'})
 
 
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize a filename by removing invalid characters.
-    
+
     Args:
         filename: Original filename
-        
+
     Returns:
         Sanitized filename
     """
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
-    return filename
+    return filename.translate(_SANITIZE_TABLE)
@@ -71,7 +71,73 @@ def test_payload_size():
 def test_validate_json():
     """Test JSON validation."""
     from src.utils.helpers import validate_json
-    
+
     assert validate_json('{"key": "value"}') is True
     assert validate_json('invalid json') is False
     assert validate_json('') is False
+
+
+def test_fit_to_tokens():
+    """Test token-budget trimming keeps the head and tail."""
+    from src.utils import helpers
+    from src.utils.helpers import fit_to_tokens
+
+    # Text within budget passes through untouched
+    assert fit_to_tokens("short text", 100) == "short text"
+
+    text = " ".join(f"word{i}" for i in range(20000))
+    trimmed = fit_to_tokens(text, 500)
+    assert len(trimmed) < len(text)
+    assert "…[truncated]…" in trimmed
+    # Both the opening and the trailing words survive the cut
+    assert trimmed.startswith("word0 ")
+    assert trimmed.rstrip().endswith("word19999")
+
+    # The assertions above also hold under the character fallback; verify the
+    # real tokenizer engaged and the output respects the token budget
+    if helpers._TOKEN_ENCODER is False:
+        pytest.skip("tiktoken vocabulary unavailable in this environment")
+    tokens = helpers._TOKEN_ENCODER.encode(trimmed)
+    # Budget plus the handful of tokens the truncation marker adds
+    assert len(tokens) <= 510
+
+
+def test_base64_roundtrip(tmp_path):
+    """Test chunked base64 encoding round-trips arbitrary binary data."""
+    import base64
+    import os
+    from src.utils.helpers import encode_file_to_base64, decode_base64_to_file
+
+    # Deliberately not a multiple of either chunk size
+    data = os.urandom(200_001)
+    source = tmp_path / "source.bin"
+    source.write_bytes(data)
+
+    encoded = encode_file_to_base64(str(source))
+    # Chunked output must match a single-shot encode exactly
+    assert encoded == base64.b64encode(data).decode('ascii')
+
+    restored = tmp_path / "restored.bin"
+    decode_base64_to_file(encoded, str(restored))
+    assert restored.read_bytes() == data
+
+
+def test_cache_path(tmp_path, monkeypatch):
+    """Test content-addressed download paths keep distinct URLs apart."""
+    monkeypatch.chdir(tmp_path)
+
+    url_a = "https://a.example.com/files/data.csv"
+    url_b = "https://b.example.com/other/data.csv"
+
+    path_a = QuizSolver._cache_path(url_a)
+    path_b = QuizSolver._cache_path(url_b)
+
+    # Same filename, different URLs: no collision
+    assert path_a.name == path_b.name == "data.csv"
+    assert path_a != path_b
+
+    # Same URL always maps to the same destination
+    assert QuizSolver._cache_path(url_a) == path_a
+
+    # Query strings don't leak into the filename
+    assert QuizSolver._cache_path("https://x.com/report.pdf?v=2").name == "report.pdf"